@@ -8,14 +8,16 @@ import argparse
 
 from dotenv import load_dotenv
 
-from shorts_creator.evaluate import run_evaluator
-from shorts_creator.scraper import run_scraper
+from shorts_creator.database import create_database_manager
+from shorts_creator.utils import setup_logging
 
 load_dotenv()
 
 
 def main() -> None:
     """Main entry point for the Reddit story scraper and evaluator."""
+    setup_logging()
+
     parser = argparse.ArgumentParser(
         description="Reddit story scraper and evaluator for viral short video potential"
     )
@@ -43,13 +45,39 @@ def main() -> None:
         default=1000,
         help="Maximum number of stories to evaluate (default: 1000)",
     )
+    evaluator_parser.add_argument(
+        "--build-cache",
+        action="store_true",
+        help="Evaluate with temperature 0 so cached evaluations are deterministic",
+    )
+    evaluator_parser.add_argument(
+        "--semantic-cache",
+        action="store_true",
+        help="Reuse evaluations of near-duplicate stories (needs the semantic extra)",
+    )
+    evaluator_parser.add_argument(
+        "--batch-api",
+        action="store_true",
+        help="Evaluate through the cheaper Gemini Batch API, results can take up to 24h",
+    )
 
     args = parser.parse_args()
 
+    # Subcommands import their API clients only when they run
     if args.command == "scrape":
-        run_scraper(args.config)
+        from shorts_creator.scraper import run_scraper
+
+        run_scraper(args.config, create_database_manager())
     elif args.command == "evaluate":
-        run_evaluator(args.max_stories)
+        from shorts_creator.evaluate import run_evaluator
+
+        run_evaluator(
+            args.max_stories,
+            create_database_manager(),
+            args.build_cache,
+            args.semantic_cache,
+            args.batch_api,
+        )
     else:
         parser.print_help()
 
@@ -3,39 +3,138 @@ Database operations for Reddit story scraper and evaluator.
 Supports SQLite and PostgreSQL databases using SQLAlchemy Core.
 """
 
+import functools
+import logging
 import os
 from abc import ABC, abstractmethod
-from typing import Dict, List
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, NamedTuple, Sequence
 
 from sqlalchemy import (
     Column,
+    Connection,
     Engine,
+    Float,
     ForeignKey,
+    Index,
+    Insert,
     Integer,
+    LargeBinary,
     MetaData,
+    Row,
     String,
     Table,
     Text,
     create_engine,
-    insert,
+    delete,
+    event,
+    select,
     text,
 )
 from sqlalchemy.dialects.postgresql import BIGINT as PostgreSQLBigint
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.dialects.sqlite import INTEGER as SQLiteInteger
 from sqlalchemy.dialects.sqlite import insert as sqlite_insert
-from sqlalchemy.exc import IntegrityError
+
+logger = logging.getLogger(__name__)
+
+# Number of pending rows after which the open transaction is committed
+COMMIT_BATCH_SIZE = 500
+
+# Maximum rows per multi-row INSERT on SQLite (bound parameter limit)
+SQLITE_INSERT_CHUNK_SIZE = 500
+
+# Number of rows fetched per round trip when streaming query results
+STREAM_BATCH_SIZE = 1000
+
+# LIMIT value used when no limit is requested, keeps the SQL text constant
+_NO_LIMIT = 2**31
+
+_UNEVALUATED_STORIES_QUERY = text(
+    """
+    SELECT s.reddit_id, s.subreddit, s.content, s.created_utc, s.flair
+    FROM stories s
+    WHERE NOT EXISTS (
+        SELECT 1 FROM stories_evaluations se WHERE se.reddit_id = s.reddit_id
+    )
+    ORDER BY s.created_utc DESC
+    LIMIT :limit
+    """
+)
+
+
+@dataclass(slots=True, frozen=True)
+class StoryRow:
+    """A stored story as returned by the database."""
+
+    reddit_id: str
+    subreddit: str
+    content: str
+    created_utc: int
+    flair: str | None
+
+
+# Summary of evaluated stories, INNER JOIN using WHERE clause
+_SUMMARY_SELECT_SQL = """
+SELECT
+    s.reddit_id,
+    s.subreddit,
+    s.content,
+    s.created_utc,
+    s.flair,
+    se.score,
+    se.category,
+    se.target_audience
+FROM stories s, stories_evaluations se
+WHERE s.reddit_id = se.reddit_id
+"""
+
+
+class _Schema(NamedTuple):
+    """Tables and prepared statements shared by managers of one dialect."""
+
+    metadata: MetaData
+    stories_table: Table
+    evaluations_table: Table
+    stories_created_utc_index: Index
+    insert_story_stmt: Insert
+    insert_evaluation_stmt: Insert
+    stats_table: Table
+    upsert_stat_stmt: Insert
+    eval_cache_table: Table
+    upsert_eval_cache_stmt: Insert
+    semantic_cache_table: Table
+    upsert_semantic_cache_stmt: Insert
+
+
+# Schemas built so far, keyed by manager class since statements are dialect-specific
+_SCHEMA_CACHE: Dict[type, _Schema] = {}
 
 
 class BaseDatabaseManager(ABC):
     """Abstract base class for database operations using SQLAlchemy Core."""
 
+    # Pending rows after which writes are committed, dialects may lower it
+    commit_batch_size = COMMIT_BATCH_SIZE
+
     def __init__(self) -> None:
         """Initialize the database manager."""
         self.engine: Engine | None = None
-        self.metadata = MetaData()
+        self._conn: Connection | None = None
+        self._pending_rows = 0
+        self._in_transaction_block = False
         self.stories_table: Table | None = None
         self.evaluations_table: Table | None = None
+        self.stories_created_utc_index: Index | None = None
+        self._insert_story_stmt: Insert | None = None
+        self._insert_evaluation_stmt: Insert | None = None
+        self.stats_table: Table | None = None
+        self._upsert_stat_stmt: Insert | None = None
+        self.eval_cache_table: Table | None = None
+        self._upsert_eval_cache_stmt: Insert | None = None
+        self.semantic_cache_table: Table | None = None
+        self._upsert_semantic_cache_stmt: Insert | None = None
         self._create_table_schema()
 
     @abstractmethod
@@ -48,6 +147,16 @@ class BaseDatabaseManager(ABC):
         """Return database-specific column type for created_utc."""
         pass
 
+    @abstractmethod
+    def _insert_ignore(self, table: Table) -> Insert:
+        """Return database-specific INSERT that skips rows with an existing key."""
+        pass
+
+    @abstractmethod
+    def _upsert(self, table: Table, key: str) -> Insert:
+        """Return database-specific INSERT that overwrites rows with an existing key."""
+        pass
+
     @abstractmethod
     def _insert_evaluations_batch(
         self, conn, evaluations: List[Dict[str, str | int]]
@@ -56,10 +165,30 @@ class BaseDatabaseManager(ABC):
         pass
 
     def _create_table_schema(self) -> None:
-        """Create the table schemas."""
-        self.stories_table = Table(
+        """Create the table schemas, reusing them across instances."""
+        schema = _SCHEMA_CACHE.get(type(self))
+        if schema is None:
+            schema = _SCHEMA_CACHE[type(self)] = self._build_table_schema()
+
+        self.metadata = schema.metadata
+        self.stories_table = schema.stories_table
+        self.evaluations_table = schema.evaluations_table
+        self.stories_created_utc_index = schema.stories_created_utc_index
+        self._insert_story_stmt = schema.insert_story_stmt
+        self._insert_evaluation_stmt = schema.insert_evaluation_stmt
+        self.stats_table = schema.stats_table
+        self._upsert_stat_stmt = schema.upsert_stat_stmt
+        self.eval_cache_table = schema.eval_cache_table
+        self._upsert_eval_cache_stmt = schema.upsert_eval_cache_stmt
+        self.semantic_cache_table = schema.semantic_cache_table
+        self._upsert_semantic_cache_stmt = schema.upsert_semantic_cache_stmt
+
+    def _build_table_schema(self) -> _Schema:
+        """Build the table schemas and the statements that use them."""
+        metadata = MetaData()
+        stories_table = Table(
             "stories",
-            self.metadata,
+            metadata,
             Column("reddit_id", String(255), primary_key=True),
             Column("subreddit", String(255), nullable=False),
             Column("content", Text, nullable=False),
@@ -67,9 +196,14 @@ class BaseDatabaseManager(ABC):
             Column("flair", String(255), nullable=True),
         )
 
-        self.evaluations_table = Table(
+        # Lets ORDER BY created_utc DESC LIMIT n stop early instead of sorting
+        stories_created_utc_index = Index(
+            "ix_stories_created_utc", stories_table.c.created_utc.desc()
+        )
+
+        evaluations_table = Table(
             "stories_evaluations",
-            self.metadata,
+            metadata,
             Column(
                 "reddit_id",
                 String(255),
@@ -81,8 +215,62 @@ class BaseDatabaseManager(ABC):
             Column("target_audience", String(255), nullable=False),
         )
 
+        # Running measurements kept between runs, e.g. Gemini latency per story
+        stats_table = Table(
+            "evaluation_stats",
+            metadata,
+            Column("name", String(255), primary_key=True),
+            Column("value", Float, nullable=False),
+        )
+
+        # Evaluations by content hash, outlives the stories they were made for
+        eval_cache_table = Table(
+            "eval_cache",
+            metadata,
+            Column("content_sha256", String(64), primary_key=True),
+            Column("score", Integer, nullable=False),
+            Column("category", String(255), nullable=False),
+            Column("target_audience", String(255), nullable=False),
+            Column("model", String(255), nullable=False),
+        )
+
+        # Content embeddings of evaluated stories for near-duplicate lookups
+        semantic_cache_table = Table(
+            "story_eval_cache",
+            metadata,
+            # Breaks ties between entries written at the same time
+            Column("id", Integer, primary_key=True, autoincrement=True),
+            Column("reddit_id", String(255), nullable=False, unique=True),
+            Column("embedding", LargeBinary, nullable=False),
+            Column("score", Integer, nullable=False),
+            Column("category", String(255), nullable=False),
+            Column("target_audience", String(255), nullable=False),
+            Column("created_at", Float, nullable=False),
+        )
+
+        # Built once so SQLAlchemy reuses the compiled form on every execute
+        return _Schema(
+            metadata=metadata,
+            stories_table=stories_table,
+            evaluations_table=evaluations_table,
+            stories_created_utc_index=stories_created_utc_index,
+            insert_story_stmt=self._insert_ignore(stories_table).returning(
+                stories_table.c.reddit_id
+            ),
+            insert_evaluation_stmt=self._insert_ignore(evaluations_table),
+            stats_table=stats_table,
+            upsert_stat_stmt=self._upsert(stats_table, "name"),
+            eval_cache_table=eval_cache_table,
+            upsert_eval_cache_stmt=self._upsert(eval_cache_table, "content_sha256"),
+            semantic_cache_table=semantic_cache_table,
+            upsert_semantic_cache_stmt=self._upsert(semantic_cache_table, "reddit_id"),
+        )
+
     def connect(self) -> None:
-        """Establish database connection."""
+        """Establish database connection, a no-op when already connected."""
+        if self._conn is not None:
+            return
+
         connection_string = self._get_connection_string()
         # Hide credentials in log output
         log_string = (
@@ -90,20 +278,97 @@ class BaseDatabaseManager(ABC):
             if "@" in connection_string
             else connection_string
         )
-        print(f"[INFO] Connecting to database: {log_string}")
-        self.engine = create_engine(connection_string)
+        logger.info("Connecting to database: %s", log_string)
+        self.engine = self._create_engine(connection_string)
+        self._conn = self.engine.connect()
+
+    def _create_engine(self, connection_string: str) -> Engine:
+        """Create the SQLAlchemy engine, subclasses may tune it."""
+        return create_engine(connection_string)
+
+    def _get_conn(self) -> Connection:
+        """Return the shared connection used for all operations."""
+        if self._conn is None:
+            raise RuntimeError("Database not connected. Call connect() first.")
+
+        return self._conn
+
+    def _track_pending(self, rows: int) -> None:
+        """Record uncommitted rows and commit once the batch size is reached."""
+        self._pending_rows += rows
+        if self._pending_rows >= self.commit_batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Commit pending writes on the shared connection."""
+        # Inside transaction() the block commits when it exits
+        if self._in_transaction_block:
+            return
+
+        conn = self._get_conn()
+        if conn.in_transaction():
+            conn.commit()
+        self._pending_rows = 0
+
+    def _end_read(self) -> None:
+        """End the transaction a read opened when no writes are pending."""
+        # A lingering SQLite read snapshot can't be upgraded once another
+        # connection commits, so the next write would fail as locked
+        if self._in_transaction_block or self._pending_rows:
+            return
+
+        conn = self._get_conn()
+        if conn.in_transaction():
+            conn.commit()
+
+    def _recover(self) -> None:
+        """Leave no failed transaction behind on the shared connection after an error."""
+        if self._in_transaction_block:
+            return
+
+        # A failed savepoint leaves the transaction usable, keep its rows
+        try:
+            self.flush()
+        except Exception as e:
+            logger.warning(
+                "Rolling back %s pending rows after a failed write: %s",
+                self._pending_rows,
+                e,
+            )
+            self._get_conn().rollback()
+            self._pending_rows = 0
+
+    @contextmanager
+    def transaction(self) -> Iterator[Connection]:
+        """Run a block in one transaction, committed on success, rolled back on error."""
+        conn = self._get_conn()
+        # Commit earlier writes so they don't depend on this block
+        self.flush()
+
+        self._in_transaction_block = True
+        try:
+            with conn.begin():
+                yield conn
+        finally:
+            self._in_transaction_block = False
+            self._pending_rows = 0
 
     def create_tables(self) -> None:
         """Create all tables and views if they don't exist."""
         if self.engine is None:
             raise RuntimeError("Database not connected. Call connect() first.")
 
-        self.metadata.create_all(self.engine)
-        print("[INFO] Database tables created/verified")
+        # Create tables, indexes and view in a single transaction
+        with self.transaction() as conn:
+            self.metadata.create_all(conn)
+            # create_all skips indexes of tables that already exist
+            if self.stories_created_utc_index is not None:
+                self.stories_created_utc_index.create(conn, checkfirst=True)
+            logger.info("Database tables created/verified")
 
-        # Create the summary view
-        self._create_summary_view()
-        print("[INFO] Summary view created/verified")
+            # Create the summary view
+            self._create_summary_view()
+        logger.info("Summary view created/verified")
 
     def _create_summary_view(self) -> None:
         """Create the summary view that joins stories and evaluations."""
@@ -113,28 +378,40 @@ class BaseDatabaseManager(ABC):
         # Drop view if it exists (for recreation with updated schema)
         drop_view_sql = "DROP VIEW IF EXISTS summary"
 
-        # Create view with INNER JOIN using WHERE clause
-        create_view_sql = """
-        CREATE VIEW summary AS
-        SELECT 
-            s.reddit_id,
-            s.subreddit,
-            s.content,
-            s.created_utc,
-            s.flair,
-            se.score,
-            se.category,
-            se.target_audience
-        FROM stories s, stories_evaluations se
-        WHERE s.reddit_id = se.reddit_id
-        """
-
-        with self.engine.connect() as conn:
-            # Drop existing view
-            conn.execute(text(drop_view_sql))
-            # Create new view
-            conn.execute(text(create_view_sql))
-            conn.commit()
+        create_view_sql = f"CREATE VIEW summary AS {_SUMMARY_SELECT_SQL}"
+
+        conn = self._get_conn()
+        # Drop existing view
+        conn.execute(text(drop_view_sql))
+        # Create new view, committed together with the drop by create_tables
+        conn.execute(text(create_view_sql))
+
+    def refresh_summary(self) -> None:
+        """Refresh the summary view, a no-op for plain views."""
+        pass
+
+    def _insert_stories_batch(
+        self, conn: Connection, stories: Sequence[StoryRow]
+    ) -> int:
+        """Insert stories with the cached statement, returns number inserted."""
+        if self._insert_story_stmt is None:
+            raise RuntimeError("Stories table not initialized.")
+
+        # Plain dicts built once per row, dataclasses.asdict() would deep-copy
+        params = [
+            {
+                "reddit_id": story.reddit_id,
+                "subreddit": story.subreddit,
+                "content": story.content,
+                "created_utc": story.created_utc,
+                "flair": story.flair,
+            }
+            for story in stories
+        ]
+
+        # RETURNING only yields rows that were actually inserted
+        result = conn.execute(self._insert_story_stmt, params)
+        return len(result.all())
 
     def insert_story(
         self,
@@ -145,63 +422,58 @@ class BaseDatabaseManager(ABC):
         flair: str | None = None,
     ) -> bool:
         """Insert a story, ignoring duplicates. Returns True if inserted, False if duplicate."""
+        return self.insert_story_row(
+            StoryRow(reddit_id, subreddit, content, created_utc, flair)
+        )
+
+    def insert_story_row(self, story: StoryRow) -> bool:
+        """Insert a StoryRow, ignoring duplicates. Returns True if inserted."""
         if self.engine is None:
             raise RuntimeError("Database not connected. Call connect() first.")
 
         if self.stories_table is None:
             raise RuntimeError("Stories table not initialized.")
 
-        stmt = insert(self.stories_table).values(
-            reddit_id=reddit_id,
-            subreddit=subreddit,
-            content=content,
-            created_utc=created_utc,
-            flair=flair,
-        )
+        inserted = self._insert_stories_batch(self._get_conn(), [story])
+        self._track_pending(inserted)
+        return inserted > 0
 
-        try:
-            with self.engine.connect() as conn:
-                result = conn.execute(stmt)
-                conn.commit()
-                return result.rowcount > 0
-        except IntegrityError:
-            # Duplicate key - story already exists
-            return False
-
-    def get_unevaluated_stories(
-        self, limit: int | None = None
-    ) -> List[Dict[str, str | int | None]]:
-        """Get stories that haven't been evaluated yet."""
+    def insert_stories_batch(self, stories: Sequence[StoryRow]) -> int:
+        """Insert stories in a single statement, ignoring duplicates. Returns number of inserted stories."""
         if self.engine is None:
             raise RuntimeError("Database not connected. Call connect() first.")
 
-        query = """
-        SELECT s.reddit_id, s.subreddit, s.content, s.created_utc, s.flair
-        FROM stories s
-        LEFT JOIN stories_evaluations se ON s.reddit_id = se.reddit_id
-        WHERE se.reddit_id IS NULL
-        ORDER BY s.created_utc DESC
-        """
-
-        if limit:
-            query += f" LIMIT {limit}"
-
-        with self.engine.connect() as conn:
-            result = conn.execute(text(query))
-            stories: List[Dict[str, str | int | None]] = []
-            for row in result:
-                stories.append(
-                    {
-                        "reddit_id": row[0],
-                        "subreddit": row[1],
-                        "content": row[2],
-                        "created_utc": row[3],
-                        "flair": row[4],
-                    }
-                )
+        if self.stories_table is None:
+            raise RuntimeError("Stories table not initialized.")
 
-        print(f"[INFO] Found {len(stories)} unevaluated stories")
-        return stories
+        if not stories:
+            return 0
+
+        # The same post often shows up in several listings, only send it once
+        unique_stories = list({story.reddit_id: story for story in stories}.values())
+
+        inserted = self._insert_stories_batch(self._get_conn(), unique_stories)
+        self._track_pending(inserted)
+        return inserted
+
+    def iter_unevaluated_stories(self, limit: int | None = None) -> Iterator[StoryRow]:
+        """Stream stories that haven't been evaluated yet."""
+        if self.engine is None:
+            raise RuntimeError("Database not connected. Call connect() first.")
+
+        # Make pending writes visible to the streaming connection
+        self.flush()
+
+        # Dedicated connection so the server-side cursor survives commits
+        # issued on the shared connection while rows are being consumed
+        with self.engine.connect().execution_options(
+            stream_results=True, max_row_buffer=STREAM_BATCH_SIZE
+        ) as conn:
+            result = conn.execute(
+                _UNEVALUATED_STORIES_QUERY, {"limit": limit or _NO_LIMIT}
+            )
+            for row in result.yield_per(STREAM_BATCH_SIZE):
+                yield StoryRow(*row)
 
     def insert_evaluations(self, evaluations: List[Dict[str, str | int]]) -> int:
         """Insert evaluations into database, returns number of successful insertions."""
@@ -214,26 +486,155 @@ class BaseDatabaseManager(ABC):
         if not evaluations:
             return 0
 
+        conn = self._get_conn()
         try:
-            with self.engine.connect() as conn:
+            # Savepoint so a failed batch doesn't discard earlier pending rows
+            with conn.begin_nested():
                 successful_insertions = self._insert_evaluations_batch(
                     conn, evaluations
                 )
-                conn.commit()
-                return successful_insertions
         except Exception as e:
-            print(f"[ERROR] Batch insert failed: {str(e)}")
+            logger.error("Batch insert failed: %s", e)
+            # Otherwise a stale or aborted transaction fails every later batch
+            self._recover()
             return 0
 
+        self._track_pending(successful_insertions)
+        return successful_insertions
+
+    def get_evaluation_stats(self) -> Dict[str, float]:
+        """Return the stored evaluation statistics by name."""
+        if self.stats_table is None:
+            raise RuntimeError("Stats table not initialized.")
+
+        rows = self._get_conn().execute(select(self.stats_table)).all()
+        self._end_read()
+        return {name: value for name, value in rows}
+
+    def save_evaluation_stats(self, stats: Dict[str, float]) -> None:
+        """Store evaluation statistics, replacing earlier values."""
+        if self._upsert_stat_stmt is None:
+            raise RuntimeError("Stats table not initialized.")
+
+        if not stats:
+            return
+
+        params = [{"name": name, "value": value} for name, value in stats.items()]
+        self._get_conn().execute(self._upsert_stat_stmt, params)
+        self._track_pending(len(params))
+
+    def get_cached_evaluations(
+        self, content_hashes: Sequence[str], model: str
+    ) -> Dict[str, Dict[str, str | int]]:
+        """Return cached evaluations made by model, keyed by content hash."""
+        if self.eval_cache_table is None:
+            raise RuntimeError("Eval cache table not initialized.")
+
+        table = self.eval_cache_table
+        conn = self._get_conn()
+        cached: Dict[str, Dict[str, str | int]] = {}
+
+        # Chunk to stay below SQLite's bound parameter limit
+        for i in range(0, len(content_hashes), SQLITE_INSERT_CHUNK_SIZE):
+            chunk = content_hashes[i : i + SQLITE_INSERT_CHUNK_SIZE]
+            rows = conn.execute(
+                select(
+                    table.c.content_sha256,
+                    table.c.score,
+                    table.c.category,
+                    table.c.target_audience,
+                ).where(table.c.content_sha256.in_(chunk), table.c.model == model)
+            )
+            for content_sha256, score, category, target_audience in rows:
+                cached[content_sha256] = {
+                    "score": score,
+                    "category": category,
+                    "target_audience": target_audience,
+                }
+
+        self._end_read()
+        return cached
+
+    def cache_evaluations(self, entries: List[Dict[str, str | int]]) -> None:
+        """Store evaluations by content hash, replacing earlier entries."""
+        if self._upsert_eval_cache_stmt is None:
+            raise RuntimeError("Eval cache table not initialized.")
+
+        if not entries:
+            return
+
+        self._get_conn().execute(self._upsert_eval_cache_stmt, entries)
+        self._track_pending(len(entries))
+
+    def get_semantic_cache_entries(self, limit: int) -> List[Row]:
+        """Return the newest semantic cache entries, oldest of them first."""
+        if self.semantic_cache_table is None:
+            raise RuntimeError("Semantic cache table not initialized.")
+
+        table = self.semantic_cache_table
+        rows = (
+            self._get_conn()
+            .execute(
+                select(
+                    table.c.embedding,
+                    table.c.score,
+                    table.c.category,
+                    table.c.target_audience,
+                )
+                .order_by(table.c.created_at.desc(), table.c.id.desc())
+                .limit(limit)
+            )
+            .all()
+        )
+        self._end_read()
+        return list(reversed(rows))
+
+    def prune_semantic_cache_entries(self, keep: int) -> int:
+        """Delete all but the newest semantic cache entries, returns rows deleted."""
+        if self.semantic_cache_table is None:
+            raise RuntimeError("Semantic cache table not initialized.")
+
+        table = self.semantic_cache_table
+        newest = (
+            select(table.c.id)
+            .order_by(table.c.created_at.desc(), table.c.id.desc())
+            .limit(keep)
+        )
+        result = self._get_conn().execute(
+            delete(table).where(table.c.id.not_in(newest.scalar_subquery()))
+        )
+        self._track_pending(result.rowcount)
+        return result.rowcount
+
+    def add_semantic_cache_entries(self, entries: List[Dict[str, object]]) -> None:
+        """Store embeddings with their evaluations, replacing earlier entries."""
+        if self._upsert_semantic_cache_stmt is None:
+            raise RuntimeError("Semantic cache table not initialized.")
+
+        if not entries:
+            return
+
+        self._get_conn().execute(self._upsert_semantic_cache_stmt, entries)
+        self._track_pending(len(entries))
+
     def close(self) -> None:
-        """Close database connection."""
+        """Commit pending writes and close database connection."""
+        if self._conn is not None:
+            self.flush()
+            self._conn.close()
+            self._conn = None
         if self.engine:
             self.engine.dispose()
+            self.engine = None
 
 
 class SQLiteDatabaseManager(BaseDatabaseManager):
     """SQLite-specific database manager."""
 
+    # An open write transaction locks the whole database, so commit after
+    # every write rather than keep a concurrent scrape waiting on the lock
+    commit_batch_size = 0
+
     def _get_connection_string(self) -> str:
         """Return SQLite connection string."""
         db_path = os.getenv("DB_PATH", "./stories.db")
@@ -243,43 +644,76 @@ class SQLiteDatabaseManager(BaseDatabaseManager):
         """Return SQLite-specific column type for created_utc."""
         return SQLiteInteger
 
+    def _create_engine(self, connection_string: str) -> Engine:
+        """Create SQLite engine with WAL journaling and explicit transactions."""
+        # Disable pysqlite's implicit transaction handling, BEGIN is emitted below
+        engine = create_engine(
+            connection_string,
+            connect_args={
+                "isolation_level": None,
+                "check_same_thread": False,
+                "timeout": 30,
+            },
+        )
+
+        @event.listens_for(engine, "connect")
+        def _set_sqlite_pragmas(dbapi_conn, connection_record) -> None:
+            dbapi_conn.execute("PRAGMA journal_mode=WAL")
+            dbapi_conn.execute("PRAGMA synchronous=NORMAL")
+            dbapi_conn.execute("PRAGMA temp_store=MEMORY")
+            dbapi_conn.execute("PRAGMA cache_size=-65536")
+
+        @event.listens_for(engine, "begin")
+        def _begin_transaction(conn) -> None:
+            conn.exec_driver_sql("BEGIN")
+
+        return engine
+
+    def _create_summary_view(self) -> None:
+        """Create the summary view plus a covering index for its join."""
+        super()._create_summary_view()
+
+        # Lets the view read evaluations from the index alone
+        conn = self._get_conn()
+        conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_eval_cover ON stories_evaluations "
+                "(reddit_id, score, category, target_audience)"
+            )
+        )
+
+    def _insert_ignore(self, table: Table) -> Insert:
+        """Return SQLite INSERT ... ON CONFLICT DO NOTHING."""
+        return sqlite_insert(table).on_conflict_do_nothing()
+
+    def _upsert(self, table: Table, key: str) -> Insert:
+        """Return SQLite INSERT ... ON CONFLICT DO UPDATE."""
+        stmt = sqlite_insert(table)
+        return stmt.on_conflict_do_update(
+            index_elements=[key],
+            set_={
+                c.name: stmt.excluded[c.name]
+                for c in table.c
+                if c.name != key and not c.primary_key
+            },
+        )
+
     def _insert_evaluations_batch(
         self, conn, evaluations: List[Dict[str, str | int]]
     ) -> int:
         """SQLite-specific batch insert implementation."""
-        if self.evaluations_table is None:
+        if self._insert_evaluation_stmt is None:
             raise RuntimeError("Evaluations table not initialized.")
 
         successful_insertions = 0
 
-        try:
-            # Try bulk insert first
-            stmt = sqlite_insert(self.evaluations_table).values(evaluations)
-            stmt = stmt.on_conflict_do_nothing()
-            result = conn.execute(stmt)
-            successful_insertions = result.rowcount
-        except Exception as e:
-            # Fallback to individual inserts for SQLite if bulk fails
-            print(f"[WARNING] Bulk insert failed, trying individual inserts: {str(e)}")
-            conn.rollback()
-            for eval_data in evaluations:
-                try:
-                    stmt = sqlite_insert(self.evaluations_table).values(
-                        reddit_id=eval_data["reddit_id"],
-                        score=eval_data["score"],
-                        category=eval_data["category"],
-                        target_audience=eval_data["target_audience"],
-                    )
-                    stmt = stmt.on_conflict_do_nothing()
-                    result = conn.execute(stmt)
-                    if result.rowcount > 0:
-                        successful_insertions += 1
-                except Exception as inner_e:
-                    print(
-                        f"[ERROR] Failed to insert evaluation for {eval_data['reddit_id']}: {str(inner_e)}"
-                    )
-
-        print(f"[INFO] Successfully inserted {successful_insertions} evaluations")
+        # Chunk to stay below SQLite's bound parameter limit
+        for i in range(0, len(evaluations), SQLITE_INSERT_CHUNK_SIZE):
+            chunk = evaluations[i : i + SQLITE_INSERT_CHUNK_SIZE]
+            result = conn.execute(self._insert_evaluation_stmt.values(chunk))
+            successful_insertions += result.rowcount
+
+        logger.info("Successfully inserted %s evaluations", successful_insertions)
         return successful_insertions
 
 
@@ -299,24 +733,85 @@ class PostgreSQLDatabaseManager(BaseDatabaseManager):
         """Return PostgreSQL-specific column type for created_utc."""
         return PostgreSQLBigint
 
+    def _create_engine(self, connection_string: str) -> Engine:
+        """Create PostgreSQL engine tuned for a single bulk writer."""
+        # Two connections: the shared writer plus one streaming reader
+        return create_engine(
+            connection_string,
+            pool_pre_ping=True,
+            pool_size=2,
+            max_overflow=0,
+            executemany_mode="values_plus_batch",
+            insertmanyvalues_page_size=1000,
+        )
+
+    def _create_summary_view(self) -> None:
+        """Create the summary as a materialized view with a unique index."""
+        conn = self._get_conn()
+
+        # Replace the plain view created by earlier versions
+        plain_view = conn.execute(
+            text(
+                "SELECT 1 FROM pg_views "
+                "WHERE viewname = 'summary' AND schemaname = current_schema()"
+            )
+        ).first()
+        if plain_view is not None:
+            conn.execute(text("DROP VIEW summary"))
+
+        conn.execute(
+            text(
+                f"CREATE MATERIALIZED VIEW IF NOT EXISTS summary AS {_SUMMARY_SELECT_SQL}"
+            )
+        )
+        # Required by REFRESH MATERIALIZED VIEW CONCURRENTLY
+        conn.execute(
+            text(
+                "CREATE UNIQUE INDEX IF NOT EXISTS ix_summary_id ON summary (reddit_id)"
+            )
+        )
+
+    def refresh_summary(self) -> None:
+        """Refresh the materialized summary without blocking readers."""
+        # Commit evaluations first so a failed refresh can't roll them back
+        self.flush()
+        conn = self._get_conn()
+        conn.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY summary"))
+        self.flush()
+
+    def _insert_ignore(self, table: Table) -> Insert:
+        """Return PostgreSQL INSERT ... ON CONFLICT (reddit_id) DO NOTHING."""
+        return pg_insert(table).on_conflict_do_nothing(index_elements=["reddit_id"])
+
+    def _upsert(self, table: Table, key: str) -> Insert:
+        """Return PostgreSQL INSERT ... ON CONFLICT DO UPDATE."""
+        stmt = pg_insert(table)
+        return stmt.on_conflict_do_update(
+            index_elements=[key],
+            set_={
+                c.name: stmt.excluded[c.name]
+                for c in table.c
+                if c.name != key and not c.primary_key
+            },
+        )
+
     def _insert_evaluations_batch(
         self, conn, evaluations: List[Dict[str, str | int]]
     ) -> int:
         """PostgreSQL-specific batch insert implementation."""
-        if self.evaluations_table is None:
+        if self._insert_evaluation_stmt is None:
             raise RuntimeError("Evaluations table not initialized.")
 
-        stmt = pg_insert(self.evaluations_table).values(evaluations)
-        stmt = stmt.on_conflict_do_nothing(index_elements=["reddit_id"])
-        result = conn.execute(stmt)
+        result = conn.execute(self._insert_evaluation_stmt.values(evaluations))
         successful_insertions = result.rowcount
 
-        print(f"[INFO] Successfully inserted {successful_insertions} evaluations")
+        logger.info("Successfully inserted %s evaluations", successful_insertions)
         return successful_insertions
 
 
+@functools.lru_cache(maxsize=1)
 def create_database_manager() -> BaseDatabaseManager:
-    """Factory function to create appropriate database manager."""
+    """Factory function to create appropriate database manager, shared per process."""
     db_type = os.getenv("DB_TYPE", "sqlite").lower()
 
     if db_type == "sqlite":
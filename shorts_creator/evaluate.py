@@ -4,15 +4,40 @@ Story Evaluator
 Uses Gemini AI to evaluate Reddit stories for viral short video potential.
 """
 
-import json
+import asyncio
+import functools
+import hashlib
+import logging
+import math
+import random
 import time
-from typing import TypedDict, Any
+from operator import itemgetter
+from typing import TYPE_CHECKING, Any, AsyncIterator, Iterator
 
+import httpx
+import orjson
+from aiolimiter import AsyncLimiter
 from google import genai
-from google.genai import types
-
-from shorts_creator.database import create_database_manager
-from shorts_creator.prompts import EVALUATION_PROMPT_TEMPLATE
+from google.genai import errors, types
+
+from shorts_creator.database import (
+    BaseDatabaseManager,
+    StoryRow,
+    create_database_manager,
+)
+from shorts_creator.prompts import (
+    EVALUATION_INSTRUCTIONS_TEMPLATE,
+    STORIES_PROMPT_PREFIX,
+    STORIES_PROMPT_TEMPLATE,
+    STORY_PROMPT_TEMPLATE,
+    STORY_SEPARATOR,
+)
+from shorts_creator.utils import JSONArrayStream
+
+if TYPE_CHECKING:
+    from shorts_creator.semantic_cache import SemanticEvaluationCache
+
+logger = logging.getLogger(__name__)
 
 # Constants
 CATEGORIES = [
@@ -29,12 +54,44 @@ CATEGORIES = [
 ]
 
 TARGET_AUDIENCES = ["general", "young_adult", "mature", "teens"]
+CATEGORY_SET = frozenset(CATEGORIES)
+AUDIENCE_SET = frozenset(TARGET_AUDIENCES)
 
 MAX_TOKENS_PER_BATCH = 50000
 MAX_STORIES_PER_BATCH = 20
-BATCH_DELAY_SECONDS = 4
+# Fewer stories per batch once measured latency says a full batch is too slow
+TARGET_BATCH_LATENCY_SECONDS = 30
+# Output budget per story until one is measured, a shaped evaluation is
+# about 35 tokens
+EXPECTED_OUTPUT_TOKENS_PER_EVALUATION = 64
+# Output budget per story as a multiple of the measured average
+OUTPUT_TOKENS_HEADROOM = 2
+# Weight of the newest batch in the running latency and output averages
+STATS_EWMA_ALPHA = 0.2
+# Batches in flight at once, and the Gemini request budget shared by all of them
+MAX_CONCURRENT_BATCHES = 4
+REQUESTS_PER_MINUTE = 15
 MAX_RETRIES = 3
+# Retries of a single Gemini request on rate limits and transient server errors
+MAX_API_RETRIES = 5
+MAX_BACKOFF_SECONDS = 60
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
 GEMINI_MODEL = "gemini-2.0-flash-lite"
+# Keep connections to the Gemini API open between batches
+HTTP_MAX_CONNECTIONS = MAX_CONCURRENT_BATCHES * 4
+HTTP_KEEPALIVE_SECONDS = 60
+# Inline batch requests are capped at 20MB per job, leave some headroom
+BATCH_JOB_MAX_BYTES = 15_000_000
+BATCH_POLL_INTERVAL_SECONDS = 30
+# Give up on batch jobs after the Batch API's target turnaround
+BATCH_JOB_TIMEOUT_SECONDS = 24 * 3600
+BATCH_JOB_DONE_STATES = {
+    "JOB_STATE_SUCCEEDED",
+    "JOB_STATE_PARTIALLY_SUCCEEDED",
+    "JOB_STATE_FAILED",
+    "JOB_STATE_CANCELLED",
+    "JOB_STATE_EXPIRED",
+}
 
 RESPONSE_SCHEMA = {
     "type": "array",
@@ -68,297 +125,770 @@ RESPONSE_SCHEMA = {
 }
 
 
-class StoryData(TypedDict):
-    reddit_id: str
-    subreddit: str
-    content: str
-    created_utc: int
-    flair: str | None
-
-
-class EvaluationData(TypedDict):
-    reddit_id: str
-    score: int
-    category: str
-    target_audience: str
+def estimate_tokens(text: str) -> int:
+    """Rough token estimation (1 token ≈ 4 characters)."""
+    # Constant time, close enough for budgeting batches
+    return len(text) // 4
+
+
+# Static instructions, byte-identical for every batch and sent before the
+# stories so implicit prefix caching can hit
+EVALUATION_INSTRUCTIONS = EVALUATION_INSTRUCTIONS_TEMPLATE(
+    categories=CATEGORIES, target_audiences=TARGET_AUDIENCES
+)
+EVALUATION_INSTRUCTIONS_TOKENS = estimate_tokens(EVALUATION_INSTRUCTIONS)
+# Tokens each story adds on top of its content: header lines and separator
+STORY_OVERHEAD_TOKENS = estimate_tokens(
+    STORY_PROMPT_TEMPLATE(reddit_id="", subreddit="", flair="None", content="")
+    + STORY_SEPARATOR
+)
+# Budget left for stories once the fixed parts of every request are counted
+MAX_STORY_TOKENS_PER_BATCH = (
+    MAX_TOKENS_PER_BATCH
+    - EVALUATION_INSTRUCTIONS_TOKENS
+    - estimate_tokens(STORIES_PROMPT_PREFIX)
+)
+
+
+def content_hash(content: str) -> str:
+    """Return the key under which evaluations of this content are cached."""
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def get_retry_delay(error: errors.APIError) -> float | None:
+    """Return the server-suggested retry delay in seconds, if any."""
+    details = (error.details or {}).get("error", {}).get("details", [])
+    for detail in details:
+        if str(detail.get("@type", "")).endswith("google.rpc.RetryInfo"):
+            try:
+                return float(str(detail.get("retryDelay", "")).rstrip("s"))
+            except ValueError:
+                return None
+    return None
+
+
+@functools.lru_cache(maxsize=1)
+def get_genai_client() -> genai.Client:
+    """Create the Gemini client, shared per process so connections are reused."""
+    limits = httpx.Limits(
+        max_connections=HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=HTTP_MAX_CONNECTIONS,
+        keepalive_expiry=HTTP_KEEPALIVE_SECONDS,
+    )
+    # HTTP/2 multiplexes the concurrent batches over a single connection
+    return genai.Client(
+        http_options=types.HttpOptions(
+            client_args={"limits": limits},
+            async_client_args={"http2": True, "limits": limits},
+        )
+    )
 
 
 class StoryEvaluator:
     """Evaluates Reddit stories for viral potential using Gemini AI."""
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        db_manager: BaseDatabaseManager | None = None,
+        build_cache: bool = False,
+        semantic_cache: bool = False,
+        batch_api: bool = False,
+    ) -> None:
         """Initialize the story evaluator."""
-        self.db_manager = create_database_manager()
-        self.client = genai.Client()
+        self.db_manager = db_manager or create_database_manager()
+        self.use_batch_api = batch_api
+        self.use_semantic_cache = semantic_cache
+        self.semantic_cache: "SemanticEvaluationCache | None" = None
+        # Deterministic sampling so cached evaluations match a fresh call
+        self.temperature = 0.0 if build_cache else 0.3
+        self.client = get_genai_client()
+        self.rate_limiter = AsyncLimiter(REQUESTS_PER_MINUTE, 60)
+        self.max_stories_per_batch = MAX_STORIES_PER_BATCH
+        self.output_tokens_per_story = EXPECTED_OUTPUT_TOKENS_PER_EVALUATION
+        self.stats: dict[str, float] = {}
+        self.token_usage = {
+            "requests": 0,
+            "cache_hits": 0,
+            "prompt": 0,
+            "cached": 0,
+            "output": 0,
+        }
 
     def connect_and_setup(self) -> None:
         """Connect to database and create tables."""
         self.db_manager.connect()
         self.db_manager.create_tables()
 
-    def get_unevaluated_stories(self, limit: int | None = None) -> list[StoryData]:
-        """Get stories that haven't been evaluated yet."""
-        raw_stories = self.db_manager.get_unevaluated_stories(limit)
-        return [
-            StoryData(
-                reddit_id=str(story["reddit_id"]),
-                subreddit=str(story["subreddit"]),
-                content=str(story["content"]),
-                created_utc=(
-                    int(story["created_utc"]) if story["created_utc"] is not None else 0
+    def tune_batch_size(self) -> None:
+        """Limit stories per batch using the latency measured in earlier runs."""
+        self.stats = self.db_manager.get_evaluation_stats()
+        latency_per_story = self.stats.get("latency_per_story")
+        if latency_per_story:
+            self.max_stories_per_batch = max(
+                1,
+                min(
+                    MAX_STORIES_PER_BATCH,
+                    int(TARGET_BATCH_LATENCY_SECONDS / latency_per_story),
                 ),
-                flair=story["flair"] if story["flair"] is None else str(story["flair"]),
             )
-            for story in raw_stories
-        ]
-
-    def estimate_tokens(self, text: str) -> int:
-        """Rough token estimation (1 token ≈ 0.75 words)."""
-        word_count = len(text.split())
-        return int(word_count / 0.75)
-
-    def format_story_for_prompt(self, story: StoryData) -> str:
-        return f"""
-Story ID: {story['reddit_id']}
-Subreddit: r/{story['subreddit']}
-Flair: {story['flair'] or 'None'}
-Content: {story['content']}
-""".strip()
-
-    def create_batches(self, stories: list[StoryData]) -> list[list[StoryData]]:
-        """Create batches of stories respecting both token and story count limits."""
-        # Sort stories by content length
-        stories_by_length = sorted(stories, key=lambda x: len(x["content"]))
 
-        batches: list[list[StoryData]] = []
-        current_batch: list[StoryData] = []
-        current_tokens = 0
+        output_tokens_per_story = self.stats.get("output_tokens_per_story")
+        if output_tokens_per_story:
+            self.output_tokens_per_story = math.ceil(
+                output_tokens_per_story * OUTPUT_TOKENS_HEADROOM
+            )
+
+        logger.info(
+            "Using up to %s stories and %s output tokens per story per batch",
+            self.max_stories_per_batch,
+            self.output_tokens_per_story,
+        )
+
+    def record_token_usage(
+        self, usage: types.GenerateContentResponseUsageMetadata | None
+    ) -> None:
+        """Add the token counts of one request to the run totals."""
+        if usage is None:
+            return
+
+        cached_tokens = usage.cached_content_token_count or 0
+        self.token_usage["requests"] += 1
+        self.token_usage["cache_hits"] += cached_tokens > 0
+        self.token_usage["prompt"] += usage.prompt_token_count or 0
+        self.token_usage["cached"] += cached_tokens
+        self.token_usage["output"] += usage.candidates_token_count or 0
+
+    def report_token_usage(self) -> None:
+        """Print the token usage of the run and how often the prefix cache hit."""
+        usage = self.token_usage
+        if not usage["requests"] or not usage["prompt"]:
+            return
 
-        for story in stories_by_length:
-            # Format story for prompt
-            story_text = self.format_story_for_prompt(story)
+        logger.info(
+            "Token usage: %s prompt (%.0f%% cached), %s output",
+            usage["prompt"],
+            usage["cached"] / usage["prompt"] * 100,
+            usage["output"],
+        )
 
-            story_tokens = self.estimate_tokens(story_text)
+        # Only the instructions are cacheable, so count requests that hit
+        hit_ratio = usage["cache_hits"] / usage["requests"]
+        logger.info(
+            "Cache hit ratio: %.0f%% of %s requests", hit_ratio * 100, usage["requests"]
+        )
 
-            # Check if adding this story would exceed either limit
-            would_exceed_tokens = current_tokens + story_tokens > MAX_TOKENS_PER_BATCH
-            would_exceed_count = len(current_batch) >= MAX_STORIES_PER_BATCH
+    def record_batch_stats(
+        self, batch_size: int, elapsed: float, output_tokens: int | None
+    ) -> None:
+        """Fold the measurements of one batch into the running averages."""
+        samples = {"latency_per_story": elapsed / batch_size}
+        if output_tokens:
+            samples["output_tokens_per_story"] = output_tokens / batch_size
+
+        for name, value in samples.items():
+            previous = self.stats.get(name)
+            self.stats[name] = (
+                value
+                if previous is None
+                else previous + STATS_EWMA_ALPHA * (value - previous)
+            )
 
-            if (would_exceed_tokens or would_exceed_count) and current_batch:
-                batches.append(current_batch)
-                current_batch = [story]
-                current_tokens = story_tokens
+    def get_unevaluated_stories(self, limit: int | None = None) -> list[StoryRow]:
+        """Get stories that haven't been evaluated yet."""
+        stories = list(self.db_manager.iter_unevaluated_stories(limit))
+
+        logger.info("Found %s unevaluated stories", len(stories))
+        return stories
+
+    def apply_cached_evaluations(self, stories: list[StoryRow]) -> list[StoryRow]:
+        """Store cached evaluations of known content, returns the stories left."""
+        hashes = [content_hash(story.content) for story in stories]
+        cached = self.db_manager.get_cached_evaluations(hashes, GEMINI_MODEL)
+        if not cached:
+            return stories
+
+        evaluations: list[dict[str, Any]] = []
+        remaining: list[StoryRow] = []
+        for story, digest in zip(stories, hashes):
+            hit = cached.get(digest)
+            if hit is None:
+                remaining.append(story)
             else:
-                current_batch.append(story)
-                current_tokens += story_tokens
+                evaluations.append({"reddit_id": story.reddit_id, **hit})
+
+        inserted = self.db_manager.insert_evaluations(evaluations)
+        # Commit now, the run may end here if every story was cached
+        self.db_manager.flush()
+        logger.info(
+            "Reused %s cached evaluations, %s stories left to evaluate",
+            inserted,
+            len(remaining),
+        )
+        return remaining
 
-        # Add the last batch
-        if current_batch:
-            batches.append(current_batch)
+    def load_semantic_cache(self) -> None:
+        """Load the embedding model and cache, if their packages are installed."""
+        try:
+            from shorts_creator.semantic_cache import SemanticEvaluationCache
+        except ImportError as e:
+            logger.warning(
+                "Semantic cache unavailable, install the semantic extra: %s", e
+            )
+            return
 
-        print(f"[INFO] Created {len(batches)} batches for processing")
+        self.semantic_cache = SemanticEvaluationCache(self.db_manager)
+
+    def apply_semantic_cache(self, stories: list[StoryRow]) -> list[StoryRow]:
+        """Store evaluations of near-duplicate stories, returns the stories left."""
+        if self.semantic_cache is None or not stories:
+            return stories
+
+        hits, remaining = self.semantic_cache.split(stories)
+        if hits:
+            inserted = self.db_manager.insert_evaluations(hits)
+            self.db_manager.flush()
+            logger.info(
+                "Reused %s evaluations of similar stories, %s stories left to evaluate",
+                inserted,
+                len(remaining),
+            )
+        return remaining
+
+    def format_story_for_prompt(self, story: StoryRow) -> str:
+        # Content is stored stripped, so the result needs no further cleanup
+        return STORY_PROMPT_TEMPLATE(
+            reddit_id=story.reddit_id,
+            subreddit=story.subreddit,
+            flair=story.flair or "None",
+            content=story.content,
+        )
+
+    def create_batches(self, stories: list[StoryRow]) -> list[list[StoryRow]]:
+        """Create batches of stories respecting both token and story count limits."""
+        # First-fit decreasing: place the largest stories first so smaller
+        # ones fill the gaps left in earlier batches
+        stories_by_size = sorted(
+            (
+                (story, STORY_OVERHEAD_TOKENS + estimate_tokens(story.content))
+                for story in stories
+            ),
+            key=lambda x: x[1],
+            reverse=True,
+        )
+
+        batches: list[list[StoryRow]] = []
+        batch_tokens: list[int] = []
+        for story, story_tokens in stories_by_size:
+            for i, batch in enumerate(batches):
+                if (
+                    len(batch) < self.max_stories_per_batch
+                    and batch_tokens[i] + story_tokens <= MAX_STORY_TOKENS_PER_BATCH
+                ):
+                    batch.append(story)
+                    batch_tokens[i] += story_tokens
+                    break
+            else:
+                # Oversized stories still get a batch of their own
+                batches.append([story])
+                batch_tokens.append(story_tokens)
+
+        logger.info("Created %s batches for processing", len(batches))
         return batches
 
-    def build_prompt(self, stories: list[StoryData]) -> str:
-        """Build the evaluation prompt for a batch of stories."""
+    def build_prompt(self, stories: list[StoryRow]) -> str:
+        """Build the per-batch part of the prompt, instructions are sent separately."""
         stories_content = [self.format_story_for_prompt(s) for s in stories]
 
-        return EVALUATION_PROMPT_TEMPLATE(
-            stories_content=stories_content,
-            categories=CATEGORIES,
-            target_audiences=TARGET_AUDIENCES,
+        return STORIES_PROMPT_TEMPLATE(stories_content=stories_content)
+
+    def generation_config(self, batch_size: int) -> types.GenerateContentConfig:
+        """Build the generation config shared by live and batch requests."""
+        return types.GenerateContentConfig(
+            system_instruction=EVALUATION_INSTRUCTIONS,
+            response_mime_type="application/json",
+            response_schema=RESPONSE_SCHEMA,
+            temperature=self.temperature,
+            # Cuts off runaway generations instead of paying for them
+            max_output_tokens=batch_size * self.output_tokens_per_story,
         )
 
-    def call_gemini(self, prompt: str) -> list[EvaluationData]:
-        """Call Gemini API with the prompt."""
-        try:
-            response = self.client.models.generate_content(
-                model=GEMINI_MODEL,
-                contents=prompt,
-                config=types.GenerateContentConfig(
-                    response_mime_type="application/json",
-                    response_schema=RESPONSE_SCHEMA,
-                    temperature=0.3,
-                ),
-            )
+    async def stream_evaluations(
+        self, prompt: str, batch_size: int
+    ) -> AsyncIterator[Any]:
+        """Call Gemini API with the prompt, yielding evaluations as they arrive."""
+        for attempt in range(MAX_API_RETRIES):
+            parser = JSONArrayStream()
+            yielded = False
+            try:
+                # Throttle proactively instead of sleeping between batches
+                async with self.rate_limiter:
+                    started = time.monotonic()
+                    stream = await self.client.aio.models.generate_content_stream(
+                        model=GEMINI_MODEL,
+                        contents=prompt,
+                        config=self.generation_config(batch_size),
+                    )
 
-            return json.loads(response.text or "[]")
-        except Exception as e:
-            print(f"[ERROR] Gemini API call failed: {str(e)}")
-            raise
+                # Malformed JSON raises here, abandoning the rest of the stream
+                usage = None
+                async for chunk in stream:
+                    # Counts are cumulative, the last chunk has the totals
+                    usage = chunk.usage_metadata or usage
+                    for evaluation in parser.feed(chunk.text or ""):
+                        yielded = True
+                        yield evaluation
+
+                # Record before checking the array, so output cut off at
+                # max_output_tokens raises the budget of later batches
+                self.record_token_usage(usage)
+                self.record_batch_stats(
+                    batch_size,
+                    time.monotonic() - started,
+                    usage.candidates_token_count if usage else None,
+                )
+                parser.close()
+                return
+            except (errors.APIError, httpx.TransportError) as e:
+                # Timeouts and dropped connections (e.g. HTTP/2 GOAWAY) are
+                # as transient as rate limits and server errors
+                api_error = e if isinstance(e, errors.APIError) else None
+                retryable = (
+                    api_error is None or api_error.code in RETRYABLE_STATUS_CODES
+                )
+                # Evaluations already handed out cannot be taken back
+                if yielded or not retryable or attempt == MAX_API_RETRIES - 1:
+                    logger.error("Gemini API call failed: %s", e)
+                    raise
+
+                # Respect the server's hint, else exponential backoff with jitter
+                delay = get_retry_delay(api_error) if api_error else None
+                if delay is None:
+                    delay = min(MAX_BACKOFF_SECONDS, 0.5 * 2**attempt)
+                    delay += random.uniform(0, 0.5)
+                logger.warning(
+                    "Gemini API error %s, retrying in %.1fs (attempt %s/%s)",
+                    api_error.code if api_error else type(e).__name__,
+                    delay,
+                    attempt + 1,
+                    MAX_API_RETRIES,
+                )
+                await asyncio.sleep(delay)
+            except Exception as e:
+                logger.error("Gemini API call failed: %s", e)
+                raise
 
     def validate_evaluation(self, evaluation: dict[str, Any]) -> bool:
         """Validate a single evaluation."""
-        required_fields = ["reddit_id", "score", "category", "target_audience"]
-
-        # Check required fields
-        for field in required_fields:
-            if field not in evaluation:
-                print(f"[ERROR] Missing field '{field}' in evaluation")
-                return False
-
-        # Validate reddit_id format
-        reddit_id = evaluation["reddit_id"]
-        if not isinstance(reddit_id, str) or len(reddit_id) < 6 or len(reddit_id) > 10:
-            print(f"[ERROR] Invalid reddit_id format: {reddit_id}")
+        try:
+            reddit_id = evaluation["reddit_id"]
+            score = evaluation["score"]
+            category = evaluation["category"]
+            target_audience = evaluation["target_audience"]
+        except KeyError as e:
+            logger.debug("Missing field %s in evaluation", e)
             return False
 
-        # Validate score
-        if not isinstance(evaluation["score"], int) or not (
-            0 <= evaluation["score"] <= 100
-        ):
-            print(f"[ERROR] Invalid score: {evaluation['score']}")
-            return False
+        # Callers log the rejected evaluation, so only the happy path is checked
+        return (
+            type(score) is int
+            and 0 <= score <= 100
+            and category in CATEGORY_SET
+            and target_audience in AUDIENCE_SET
+            and isinstance(reddit_id, str)
+            and 6 <= len(reddit_id) <= 10
+        )
 
-        # Validate category
-        if evaluation["category"] not in CATEGORIES:
-            print(f"[ERROR] Invalid category: {evaluation['category']}")
+    def belongs_to_batch(self, evaluation: Any, batch_reddit_ids: set[str]) -> bool:
+        """Check that an evaluation is valid and for a story of the batch."""
+        # Decoded items are already dicts, no need to copy them
+        if not (isinstance(evaluation, dict) and self.validate_evaluation(evaluation)):
+            logger.debug("Skipping invalid evaluation: %s", evaluation)
             return False
 
-        # Validate target audience
-        if evaluation["target_audience"] not in TARGET_AUDIENCES:
-            print(f"[ERROR] Invalid target audience: {evaluation['target_audience']}")
+        if evaluation["reddit_id"] not in batch_reddit_ids:
+            logger.debug(
+                "Evaluation for unexpected reddit_id: %s", evaluation["reddit_id"]
+            )
             return False
 
         return True
 
-    def process_batch(self, batch: list[StoryData]) -> bool:
+    async def process_batch(self, batch: list[StoryRow]) -> bool:
         """Process a single batch of stories, returns True if successful."""
-        print(f"[INFO] Processing batch of {len(batch)} stories")
+        logger.info("Processing batch of %s stories", len(batch))
 
         # Build prompt
         prompt = self.build_prompt(batch)
 
-        # Call Gemini
+        # Validate each evaluation as it streams in and ensure all batch
+        # stories are evaluated
+        valid_evaluations: list[dict[str, Any]] = []
+        batch_reddit_ids = {story.reddit_id for story in batch}
+        received = 0
+
         try:
-            evaluations = self.call_gemini(prompt)
+            async for evaluation in self.stream_evaluations(prompt, len(batch)):
+                received += 1
+                if self.belongs_to_batch(evaluation, batch_reddit_ids):
+                    valid_evaluations.append(evaluation)
         except Exception as e:
-            print(f"[ERROR] Failed to get evaluations from Gemini: {str(e)}")
-            return False
+            if not valid_evaluations:
+                logger.error("Failed to get evaluations from Gemini: %s", e)
+                return False
 
-        # Validate response structure
-        if not isinstance(evaluations, list):
-            print("[ERROR] Invalid response structure: not a list")
-            return False
+            # E.g. output truncated at max_output_tokens, keep what was parsed
+            logger.warning(
+                "Evaluation stream ended early, saving %s parsed evaluations: %s",
+                len(valid_evaluations),
+                e,
+            )
 
-        if len(evaluations) == 0:
-            print("[WARNING] Received empty evaluations list")
+        if received == 0:
+            logger.warning("Received empty evaluations list")
             return False
 
-        # Validate each evaluation and ensure all batch stories are evaluated
-        valid_evaluations: list[dict[str, Any]] = []
-        batch_reddit_ids = {story["reddit_id"] for story in batch}
-        evaluated_reddit_ids = set()
-
-        for evaluation in evaluations:
-            if self.validate_evaluation(dict(evaluation)):
-                eval_dict = dict(evaluation)
-                reddit_id = eval_dict["reddit_id"]
-
-                # Check if this reddit_id was in our batch
-                if reddit_id in batch_reddit_ids:
-                    valid_evaluations.append(eval_dict)
-                    evaluated_reddit_ids.add(reddit_id)
-                else:
-                    print(f"[WARNING] Evaluation for unexpected reddit_id: {reddit_id}")
-            else:
-                print(f"[WARNING] Skipping invalid evaluation: {evaluation}")
+        return self.save_evaluations(batch, valid_evaluations)
 
+    def save_evaluations(
+        self, batch: list[StoryRow], valid_evaluations: list[dict[str, Any]]
+    ) -> bool:
+        """Insert the valid evaluations of a batch, returns True if successful."""
         # Check if we got evaluations for all stories in the batch
-        missing_ids = batch_reddit_ids - evaluated_reddit_ids
+        missing_ids = {story.reddit_id for story in batch}.difference(
+            map(itemgetter("reddit_id"), valid_evaluations)
+        )
         if missing_ids:
-            print(f"[WARNING] Missing evaluations for reddit_ids: {missing_ids}")
+            logger.warning("Missing evaluations for reddit_ids: %s", missing_ids)
 
         # Insert valid evaluations
         if valid_evaluations:
             try:
                 inserted_count = self.db_manager.insert_evaluations(valid_evaluations)
-                print(
-                    f"[INFO] Successfully processed {inserted_count}/{len(batch)} evaluations"
+                self.cache_evaluations(batch, valid_evaluations)
+                logger.info(
+                    "Successfully processed %s/%s evaluations",
+                    inserted_count,
+                    len(batch),
                 )
                 return inserted_count > 0
             except Exception as e:
-                print(f"[ERROR] Database insertion failed: {str(e)}")
+                logger.error("Database insertion failed: %s", e)
                 return False
         else:
-            print("[ERROR] No valid evaluations to insert")
+            logger.error("No valid evaluations to insert")
             return False
 
+    def cache_evaluations(
+        self, batch: list[StoryRow], valid_evaluations: list[dict[str, Any]]
+    ) -> None:
+        """Remember evaluations by content so later runs can skip the API call."""
+        hashes = {story.reddit_id: content_hash(story.content) for story in batch}
+        try:
+            self.db_manager.cache_evaluations(
+                [
+                    {
+                        "content_sha256": hashes[evaluation["reddit_id"]],
+                        "score": evaluation["score"],
+                        "category": evaluation["category"],
+                        "target_audience": evaluation["target_audience"],
+                        "model": GEMINI_MODEL,
+                    }
+                    for evaluation in valid_evaluations
+                ]
+            )
+            if self.semantic_cache is not None:
+                self.semantic_cache.add(valid_evaluations)
+        except Exception as e:
+            logger.warning("Failed to cache evaluations: %s", e)
+
+    def submit_batch_jobs(
+        self, batches: list[list[StoryRow]]
+    ) -> Iterator[tuple[str, list[list[StoryRow]]]]:
+        """Submit batches to the Gemini Batch API, yielding each job name with its batches."""
+        requests: list[types.InlinedRequest] = []
+        job_batches: list[list[StoryRow]] = []
+        job_bytes = 0
+
+        for batch in batches:
+            prompt = self.build_prompt(batch)
+            prompt_bytes = len(prompt.encode())
+            if requests and job_bytes + prompt_bytes > BATCH_JOB_MAX_BYTES:
+                yield self._submit_batch_job(requests), job_batches
+                requests, job_batches, job_bytes = [], [], 0
+
+            # The instructions are inlined in every request of the job
+            config = self.generation_config(len(batch))
+            requests.append(types.InlinedRequest(contents=prompt, config=config))
+            job_batches.append(batch)
+            job_bytes += prompt_bytes
+
+        if requests:
+            yield self._submit_batch_job(requests), job_batches
+
+    def _submit_batch_job(self, requests: list[types.InlinedRequest]) -> str:
+        job = self.client.batches.create(
+            model=GEMINI_MODEL,
+            src=requests,
+            config=types.CreateBatchJobConfig(display_name="story-evaluations"),
+        )
+        if job.name is None:
+            raise RuntimeError("Gemini returned a batch job without a name")
+
+        logger.info("Submitted batch job %s with %s requests", job.name, len(requests))
+        return job.name
+
+    def wait_for_batch_job(self, job_name: str, deadline: float) -> types.BatchJob:
+        """Poll a batch job until it reaches a final state or the deadline passes."""
+        while True:
+            job = self.client.batches.get(name=job_name)
+            state = job.state.name if job.state else "JOB_STATE_UNSPECIFIED"
+            if state in BATCH_JOB_DONE_STATES:
+                logger.info("Batch job %s finished with %s", job_name, state)
+                return job
+
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Batch job {job_name} did not finish in time")
+
+            logger.info(
+                "Batch job %s is %s, checking again in %ss",
+                job_name,
+                state,
+                BATCH_POLL_INTERVAL_SECONDS,
+            )
+            time.sleep(BATCH_POLL_INTERVAL_SECONDS)
+
+    def process_batch_job_results(
+        self, job: types.BatchJob, batches: list[list[StoryRow]]
+    ) -> int:
+        """Validate and insert the results of a batch job, returns stories processed."""
+        responses = job.dest.inlined_responses if job.dest else None
+        if not responses:
+            logger.error("Batch job %s returned no responses", job.name)
+            return 0
+
+        if len(responses) != len(batches):
+            logger.warning(
+                "Batch job %s returned %s responses for %s requests",
+                job.name,
+                len(responses),
+                len(batches),
+            )
+
+        total_processed = 0
+        # Inlined responses come back in request order
+        for i, (batch, inlined) in enumerate(zip(batches, responses)):
+            if inlined.error or not inlined.response:
+                logger.error("Batch %s failed in batch job: %s", i + 1, inlined.error)
+                continue
+
+            try:
+                evaluations = orjson.loads(inlined.response.text or "[]")
+            except orjson.JSONDecodeError as e:
+                logger.error("Invalid JSON for batch %s: %s", i + 1, e)
+                continue
+
+            if not isinstance(evaluations, list) or not evaluations:
+                logger.error("Invalid response structure for batch %s", i + 1)
+                continue
+
+            batch_reddit_ids = {story.reddit_id for story in batch}
+            valid_evaluations = [
+                evaluation
+                for evaluation in evaluations
+                if self.belongs_to_batch(evaluation, batch_reddit_ids)
+            ]
+
+            if self.save_evaluations(batch, valid_evaluations):
+                total_processed += len(batch)
+
+        return total_processed
+
+    def run_batch_mode(self, batches: list[list[StoryRow]]) -> int:
+        """Evaluate batches through the Gemini Batch API, returns stories processed."""
+        deadline = time.monotonic() + BATCH_JOB_TIMEOUT_SECONDS
+        jobs: list[tuple[str, list[list[StoryRow]]]] = []
+        total_processed = 0
+        try:
+            # Collected one by one so a failed submission keeps earlier jobs
+            for submitted in self.submit_batch_jobs(batches):
+                jobs.append(submitted)
+
+            while jobs:
+                job_name, job_batches = jobs[0]
+                finished = self.wait_for_batch_job(job_name, deadline)
+                jobs.pop(0)
+                total_processed += self.process_batch_job_results(finished, job_batches)
+        finally:
+            # Jobs left behind on errors, timeouts or Ctrl-C would be billed
+            # without their results ever being stored
+            for job_name, _ in jobs:
+                self.cancel_batch_job(job_name)
+        return total_processed
+
+    def cancel_batch_job(self, job_name: str) -> None:
+        """Cancel a batch job whose results will not be collected."""
+        try:
+            self.client.batches.cancel(name=job_name)
+            logger.warning("Cancelled unfinished batch job %s", job_name)
+        except Exception as e:
+            logger.error("Failed to cancel batch job %s: %s", job_name, e)
+
+    async def _process_batch_safely(self, batch: list[StoryRow]) -> bool:
+        """Process a batch, reporting unexpected errors as a failure."""
+        try:
+            return await self.process_batch(batch)
+        except Exception as e:
+            logger.error("Batch processing failed: %s", e)
+            return False
+
+    async def process_batches(self, batches: list[list[StoryRow]]) -> int:
+        """Process batches through a bounded pool, returns number of stories processed."""
+        failures = 0
+        stopped = False
+        total_processed = 0
+        next_index = 0
+        pending: dict[asyncio.Task[bool], int] = {}
+
+        # Refill the pool as soon as any batch finishes rather than in waves
+        while pending or next_index < len(batches):
+            while (
+                len(pending) < MAX_CONCURRENT_BATCHES
+                and next_index < len(batches)
+                and not stopped
+            ):
+                logger.info("Processing batch %s/%s", next_index + 1, len(batches))
+                task = asyncio.create_task(
+                    self._process_batch_safely(batches[next_index])
+                )
+                pending[task] = next_index
+                next_index += 1
+
+            if not pending:
+                break
+
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                i = pending.pop(task)
+                if task.result():
+                    total_processed += len(batches[i])
+                    failures = 0  # Reset failure count on success
+                else:
+                    failures += 1
+                    logger.error("Batch %s failed (failure count: %s)", i + 1, failures)
+
+                    if failures >= MAX_RETRIES and not stopped:
+                        stopped = True
+                        logger.error(
+                            "Maximum failures (%s) reached. Stopping.", MAX_RETRIES
+                        )
+
+        return total_processed
+
     def run(self, max_stories: int) -> None:
         """Main execution function."""
-        print(f"[INFO] Starting story evaluation with max_stories={max_stories}")
+        logger.info("Starting story evaluation with max_stories=%s", max_stories)
 
         # Connect and setup
         try:
             self.connect_and_setup()
         except Exception as e:
-            print(f"[ERROR] Database connection failed: {str(e)}")
+            logger.error("Database connection failed: %s", e)
             return
 
+        # Every exit after connecting must refresh the summary and close
+        try:
+            self.evaluate_stories(max_stories)
+        finally:
+            self.finish_run()
+
+    def evaluate_stories(self, max_stories: int) -> None:
+        """Evaluate up to max_stories unevaluated stories."""
+        try:
+            self.tune_batch_size()
+        except Exception as e:
+            logger.warning("Failed to load evaluation stats: %s", e)
+
         # Get unevaluated stories
         try:
             stories = self.get_unevaluated_stories(max_stories)
         except Exception as e:
-            print(f"[ERROR] Failed to fetch stories: {str(e)}")
+            logger.error("Failed to fetch stories: %s", e)
             return
 
+        # Serve stories evaluated before, e.g. under another reddit_id
+        try:
+            stories = self.apply_cached_evaluations(stories)
+        except Exception as e:
+            logger.warning("Failed to apply cached evaluations: %s", e)
+
+        # Then reposts and near-duplicates of evaluated stories
+        if self.use_semantic_cache:
+            try:
+                if self.semantic_cache is None:
+                    self.load_semantic_cache()
+                stories = self.apply_semantic_cache(stories)
+            except Exception as e:
+                logger.warning("Failed to apply semantic cache: %s", e)
+
         if not stories:
-            print("[INFO] No stories to evaluate")
+            logger.info("No stories to evaluate")
             return
 
         # Create batches
         try:
             batches = self.create_batches(stories)
         except Exception as e:
-            print(f"[ERROR] Failed to create batches: {str(e)}")
+            logger.error("Failed to create batches: %s", e)
             return
 
-        # Process batches
-        failures = 0
-        total_processed = 0
-
-        for i, batch in enumerate(batches, 1):
-            print(f"[INFO] Processing batch {i}/{len(batches)}")
-
-            try:
-                success = self.process_batch(batch)
-            except Exception as e:
-                print(f"[ERROR] Batch processing failed: {str(e)}")
-                success = False
-
-            if success:
-                total_processed += len(batch)
-                failures = 0  # Reset failure count on success
+        # Process batches, evaluations are committed in groups across batches
+        try:
+            if self.use_batch_api:
+                logger.info("Using Gemini Batch API for %s stories", len(stories))
+                total_processed = self.run_batch_mode(batches)
             else:
-                failures += 1
-                print(f"[ERROR] Batch {i} failed (failure count: {failures})")
-
-                if failures >= MAX_RETRIES:
-                    print(
-                        f"[ERROR] Maximum failures ({MAX_RETRIES}) reached. Stopping."
-                    )
-                    break
-
-            # Rate limiting delay
-            if i < len(batches):  # Don't delay after the last batch
-                print(
-                    f"[INFO] Waiting {BATCH_DELAY_SECONDS} seconds before next batch..."
-                )
-                time.sleep(BATCH_DELAY_SECONDS)
+                total_processed = asyncio.run(self.process_batches(batches))
+        except Exception as e:
+            logger.error("Batch processing failed: %s", e)
+            total_processed = 0
+        finally:
+            # Keep what was already evaluated even if processing is interrupted
+            self.db_manager.flush()
+
+        logger.info("Evaluation complete. Processed %s stories", total_processed)
+        self.report_token_usage()
+
+    def finish_run(self) -> None:
+        """Save stats, refresh the summary and close."""
+        # Keep the measured latency for sizing the batches of the next run
+        try:
+            self.db_manager.save_evaluation_stats(self.stats)
+        except Exception as e:
+            logger.warning("Failed to save evaluation stats: %s", e)
 
-        print(f"[INFO] Evaluation complete. Processed {total_processed} stories")
+        # Refresh the summary with the new evaluations
+        try:
+            self.db_manager.refresh_summary()
+        except Exception as e:
+            logger.warning("Failed to refresh summary: %s", e)
 
         # Close database connection
         try:
             self.db_manager.close()
         except Exception as e:
-            print(f"[WARNING] Error closing database connection: {str(e)}")
+            logger.warning("Error closing database connection: %s", e)
 
 
-def run_evaluator(max_stories: int) -> None:
+def run_evaluator(
+    max_stories: int,
+    db_manager: BaseDatabaseManager | None = None,
+    build_cache: bool = False,
+    semantic_cache: bool = False,
+    batch_api: bool = False,
+) -> None:
     """Run the story evaluator."""
     try:
-        evaluator = StoryEvaluator()
+        evaluator = StoryEvaluator(db_manager, build_cache, semantic_cache, batch_api)
         evaluator.run(max_stories)
     except Exception as e:
-        print(f"[ERROR] Evaluator failed to start: {str(e)}")
+        logger.error("Evaluator failed to start: %s", e)
@@ -1,5 +1,5 @@
-def EVALUATION_PROMPT_TEMPLATE(
-    stories_content: list[str], categories: list[str], target_audiences: list[str]
+def EVALUATION_INSTRUCTIONS_TEMPLATE(
+    categories: list[str], target_audiences: list[str]
 ):
     return f"""
 You are an expert content creator who specializes in viral short-form video content for entertainment purposes. Your task is to evaluate Reddit stories for their potential to become captivating, ENTERTAINING viral short videos that people would enjoy watching and sharing.
@@ -51,10 +51,16 @@ categories: {", ".join(categories)}
 target audiences: {", ".join(target_audiences)}
 
 Make sure to evaluate all stories of the list.
+""".strip()
 
-Stories to evaluate:
 
----
+STORY_PROMPT_TEMPLATE = (
+    "Story ID: {reddit_id}\nSubreddit: r/{subreddit}\nFlair: {flair}\nContent: {content}"
+).format
 
-{"\n\n---\n\n".join(stories_content)}
-""".strip()
+STORIES_PROMPT_PREFIX = "Stories to evaluate:\n\n---\n\n"
+STORY_SEPARATOR = "\n\n---\n\n"
+
+
+def STORIES_PROMPT_TEMPLATE(stories_content: list[str]):
+    return STORIES_PROMPT_PREFIX + STORY_SEPARATOR.join(stories_content)
@@ -2,23 +2,28 @@
 Reddit scraper for extracting text-based stories from specified subreddits.
 """
 
+import logging
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import UTC, datetime, timedelta
-from typing import TypedDict
 
 import praw
 from praw.models import Submission
 
-from shorts_creator.database import create_database_manager
+from shorts_creator.database import (
+    BaseDatabaseManager,
+    StoryRow,
+    create_database_manager,
+)
 from shorts_creator.utils import load_config
 
+logger = logging.getLogger(__name__)
 
-class StoryData(TypedDict):
-    reddit_id: str
-    subreddit: str
-    content: str
-    created_utc: int
-    flair: str | None
+# Concurrent Reddit listing requests, and subreddits scraped concurrently so
+# one worker filters posts while the others hold the request slots
+MAX_CONCURRENT_REQUESTS = 2
+MAX_SCRAPE_WORKERS = MAX_CONCURRENT_REQUESTS + 1
 
 
 class RedditScraper:
@@ -27,12 +32,24 @@ class RedditScraper:
     def __init__(self, min_content_length: int = 100) -> None:
         """Initialize the Reddit scraper."""
         self.min_content_length = min_content_length
-        self.reddit = praw.Reddit(
-            client_id=os.getenv("REDDIT_CLIENT_ID"),
-            client_secret=os.getenv("REDDIT_CLIENT_SECRET"),
-            user_agent=os.getenv("REDDIT_USER_AGENT"),
-        )
-        print("[INFO] Connected to Reddit API as read-only")
+        self._request_slots = threading.Semaphore(MAX_CONCURRENT_REQUESTS)
+        self._local = threading.local()
+
+    @property
+    def reddit(self) -> praw.Reddit:
+        """Reddit client of the current thread, PRAW instances are not thread-safe."""
+        reddit = getattr(self._local, "reddit", None)
+        if reddit is None:
+            reddit = self._local.reddit = praw.Reddit(
+                client_id=os.getenv("REDDIT_CLIENT_ID"),
+                client_secret=os.getenv("REDDIT_CLIENT_SECRET"),
+                user_agent=os.getenv("REDDIT_USER_AGENT"),
+            )
+            logger.info(
+                "Connected to Reddit API as read-only in %s",
+                threading.current_thread().name,
+            )
+        return reddit
 
     def format_content(self, submission: Submission) -> str:
         """Format submission title and content as markdown."""
@@ -46,41 +63,46 @@ class RedditScraper:
             # Title only
             return title
 
-    def is_valid_story(self, submission: Submission) -> bool:
-        """Check if submission is a valid text-based story."""
-        # Skip if it's a link post (has URL but no selftext)
-        if submission.url and not submission.is_self:
-            return False
+    def is_valid_story(self, submission: Submission) -> str | None:
+        """Return the formatted content if submission is a valid text-based story."""
+        # Skip link posts, is_self comes with the listing payload
+        if not submission.is_self:
+            return None
 
         # Get formatted content and check minimum length
         content = self.format_content(submission)
         if len(content) < self.min_content_length:
-            return False
+            return None
 
-        return True
+        return content
 
-    def get_stories_from_subreddit(self, subreddit_name: str) -> list[StoryData]:
+    def get_stories_from_subreddit(self, subreddit_name: str) -> list[StoryRow]:
         """Scrape stories from a subreddit from the last 24 hours."""
-        print(f"[INFO] Scraping r/{subreddit_name} for stories from last 24 hours")
+        logger.info("Scraping r/%s for stories from last 24 hours", subreddit_name)
 
         subreddit = self.reddit.subreddit(subreddit_name)
         cutoff_time = datetime.now(UTC) - timedelta(hours=24)
         cutoff_timestamp = cutoff_time.timestamp()
 
-        stories: list[StoryData] = []
+        stories: list[StoryRow] = []
         processed = 0
 
         try:
-            # Get posts from multiple sources
-            # top() supports time filters, others don't
-            post_sources = [
-                ("hot", subreddit.hot(limit=100)),
-                ("rising", subreddit.rising(limit=100)),
-                ("top_day", subreddit.top(time_filter="day")),
-            ]
+            # Hold a request slot only while listings are fetched, posts are
+            # filtered after releasing it
+            with self._request_slots:
+                # Get posts from multiple sources
+                # top() supports time filters, others don't
+                post_sources = [
+                    ("hot", list(subreddit.hot(limit=100))),
+                    ("rising", list(subreddit.rising(limit=100))),
+                    ("top_day", list(subreddit.top(time_filter="day"))),
+                ]
 
             for source_name, posts in post_sources:
-                print(f"[INFO] Processing {source_name} posts from r/{subreddit_name}")
+                logger.info(
+                    "Processing %s posts from r/%s", source_name, subreddit_name
+                )
 
                 for submission in posts:
                     processed += 1
@@ -90,18 +112,18 @@ class RedditScraper:
                         continue
 
                     # Skip if not a valid story
-                    if not self.is_valid_story(submission):
-                        print(f"[DEBUG] Skipped: {submission.id} - not a valid story")
+                    content = self.is_valid_story(submission)
+                    if content is None:
+                        logger.debug("Skipped: %s - not a valid story", submission.id)
                         continue
 
-                    content = self.format_content(submission)
                     flair: str | None = (
                         submission.link_flair_text
                         if submission.link_flair_text
                         else None
                     )
                     stories.append(
-                        StoryData(
+                        StoryRow(
                             reddit_id=submission.id,
                             subreddit=subreddit_name,
                             content=content,
@@ -111,20 +133,28 @@ class RedditScraper:
                     )
 
                     flair_info = f" [Flair: {flair}]" if flair else ""
-                    print(
-                        f"[DEBUG] Found story: {submission.id} ({len(content)} chars){flair_info} from {source_name}"
+                    logger.debug(
+                        "Found story: %s (%s chars)%s from %s",
+                        submission.id,
+                        len(content),
+                        flair_info,
+                        source_name,
                     )
 
         except Exception as e:
-            print(f"[ERROR] Error scraping r/{subreddit_name}: {e}")
+            logger.error("Error scraping r/%s: %s", subreddit_name, e)
 
-        print(
-            f"[INFO] Found {len(stories)} valid stories from r/{subreddit_name} "
-            f"(processed {processed} posts)"
+        logger.info(
+            "Found %s valid stories from r/%s (processed %s posts)",
+            len(stories),
+            subreddit_name,
+            processed,
         )
         return stories
 
-    def run(self, config_file: str) -> None:
+    def run(
+        self, config_file: str, db_manager: BaseDatabaseManager | None = None
+    ) -> None:
         """Main execution function."""
         # Load configuration
         config = load_config(config_file)
@@ -132,13 +162,13 @@ class RedditScraper:
         min_length = config.get("min_content_length", 100)
 
         if not subreddits:
-            print("[ERROR] No subreddits specified in config")
+            logger.error("No subreddits specified in config")
             return
 
-        print(f"[INFO] Starting scrape: {len(subreddits)} subreddits, last 24 hours")
+        logger.info("Starting scrape: %s subreddits, last 24 hours", len(subreddits))
 
         # Initialize database
-        db = create_database_manager()
+        db = db_manager or create_database_manager()
 
         try:
             # Setup database
@@ -148,43 +178,39 @@ class RedditScraper:
             # Update minimum content length
             self.min_content_length = min_length
 
-            total_new_stories = 0
-            total_duplicates = 0
-
-            # Scrape each subreddit
-            for subreddit_name in subreddits:
-                stories = self.get_stories_from_subreddit(subreddit_name)
-
-                # Store stories in database
-                for story in stories:
-                    inserted = db.insert_story(
-                        story["reddit_id"],
-                        story["subreddit"],
-                        story["content"],
-                        story["created_utc"],
-                        story["flair"],
-                    )
-
-                    if inserted:
-                        total_new_stories += 1
-                        print(f"[INFO] Stored new story: {story['reddit_id']}")
-                    else:
-                        total_duplicates += 1
-                        print(f"[DEBUG] Duplicate story skipped: {story['reddit_id']}")
-
-            print(
-                f"[INFO] Scraping complete: {total_new_stories} new stories, "
-                f"{total_duplicates} duplicates"
+            # Scrape subreddits concurrently
+            all_stories: list[StoryRow] = []
+            with ThreadPoolExecutor(
+                max_workers=min(MAX_SCRAPE_WORKERS, len(subreddits))
+            ) as executor:
+                futures = [
+                    executor.submit(self.get_stories_from_subreddit, name)
+                    for name in subreddits
+                ]
+                for future in as_completed(futures):
+                    all_stories.extend(future.result())
+
+            # Store all stories in one transaction
+            with db.transaction():
+                total_new_stories = db.insert_stories_batch(all_stories)
+            total_duplicates = len(all_stories) - total_new_stories
+
+            logger.info(
+                "Scraping complete: %s new stories, %s duplicates",
+                total_new_stories,
+                total_duplicates,
             )
 
         except Exception as e:
-            print(f"[ERROR] Fatal error: {e}")
+            logger.error("Fatal error: %s", e)
             raise
         finally:
             db.close()
 
 
-def run_scraper(config_file: str) -> None:
+def run_scraper(
+    config_file: str, db_manager: BaseDatabaseManager | None = None
+) -> None:
     """Run the Reddit scraper with the specified configuration."""
     scraper = RedditScraper()
-    scraper.run(config_file)
+    scraper.run(config_file, db_manager)
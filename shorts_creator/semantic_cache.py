@@ -0,0 +1,131 @@
+"""
+Semantic cache reusing evaluations of near-duplicate stories.
+Requires the optional sentence-transformers and faiss-cpu packages.
+"""
+
+import logging
+import time
+from typing import Any
+
+import faiss
+import numpy as np
+from sentence_transformers import SentenceTransformer
+
+from shorts_creator.database import BaseDatabaseManager, StoryRow
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+# Cosine similarity from which two stories share an evaluation
+SIMILARITY_THRESHOLD = 0.87
+ENCODE_BATCH_SIZE = 64
+# Entries kept in the index and the table, the oldest are evicted first
+MAX_CACHE_ENTRIES = 50_000
+
+
+class SemanticEvaluationCache:
+    """Finds evaluations of previously evaluated stories with similar content."""
+
+    def __init__(self, db_manager: BaseDatabaseManager) -> None:
+        """Load the embedding model and the stored cache entries."""
+        self.db_manager = db_manager
+        self.model = SentenceTransformer(EMBEDDING_MODEL)
+        # Inner product over normalized embeddings is cosine similarity
+        self.index = faiss.IndexFlatIP(self.model.get_sentence_embedding_dimension())
+        # Evaluations aligned with the rows of the index
+        self.evaluations: list[dict[str, Any]] = []
+        # Embeddings of cache misses, added once they have been evaluated
+        self._pending: dict[str, np.ndarray] = {}
+        self._load()
+
+    def _load(self) -> None:
+        rows = self.db_manager.get_semantic_cache_entries(MAX_CACHE_ENTRIES)
+        if not rows:
+            return
+
+        self.index.add(
+            np.vstack([np.frombuffer(row.embedding, dtype=np.float32) for row in rows])
+        )
+        self.evaluations = [
+            {
+                "score": row.score,
+                "category": row.category,
+                "target_audience": row.target_audience,
+            }
+            for row in rows
+        ]
+        logger.info("Loaded %s semantic cache entries", len(rows))
+
+    def split(
+        self, stories: list[StoryRow]
+    ) -> tuple[list[dict[str, Any]], list[StoryRow]]:
+        """Return evaluations for near-duplicates and the stories without a match."""
+        embeddings = self.model.encode(
+            [story.content for story in stories],
+            batch_size=ENCODE_BATCH_SIZE,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+        ).astype(np.float32)
+
+        if self.index.ntotal:
+            similarities, ids = self.index.search(embeddings, 1)
+        else:
+            similarities = np.zeros((len(stories), 1), dtype=np.float32)
+            ids = np.full((len(stories), 1), -1)
+
+        hits: list[dict[str, Any]] = []
+        misses: list[StoryRow] = []
+        for story, embedding, similarity, match in zip(
+            stories, embeddings, similarities[:, 0], ids[:, 0]
+        ):
+            if match >= 0 and similarity >= SIMILARITY_THRESHOLD:
+                hits.append({"reddit_id": story.reddit_id, **self.evaluations[match]})
+            else:
+                misses.append(story)
+                self._pending[story.reddit_id] = embedding
+
+        return hits, misses
+
+    def add(self, evaluations: list[dict[str, Any]]) -> None:
+        """Add fresh evaluations of stories passed to split() to the cache."""
+        entries: list[dict[str, Any]] = []
+        vectors: list[np.ndarray] = []
+        created_at = time.time()
+
+        for evaluation in evaluations:
+            embedding = self._pending.pop(evaluation["reddit_id"], None)
+            if embedding is None:
+                continue
+
+            vectors.append(embedding)
+            entries.append(
+                {
+                    "reddit_id": evaluation["reddit_id"],
+                    "embedding": embedding.tobytes(),
+                    "score": evaluation["score"],
+                    "category": evaluation["category"],
+                    "target_audience": evaluation["target_audience"],
+                    "created_at": created_at,
+                }
+            )
+
+        if not entries:
+            return
+
+        self.db_manager.add_semantic_cache_entries(entries)
+        self.index.add(np.vstack(vectors))
+        self.evaluations.extend(
+            {key: entry[key] for key in ("score", "category", "target_audience")}
+            for entry in entries
+        )
+        self._evict()
+
+    def _evict(self) -> None:
+        excess = self.index.ntotal - MAX_CACHE_ENTRIES
+        if excess <= 0:
+            return
+
+        # Flat indexes renumber the remaining rows, keeping them aligned
+        self.index.remove_ids(faiss.IDSelectorRange(0, excess))
+        del self.evaluations[:excess]
+        self.db_manager.prune_semantic_cache_entries(MAX_CACHE_ENTRIES)
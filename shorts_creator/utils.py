@@ -2,20 +2,146 @@
 Utility functions for the Reddit story scraper and evaluator.
 """
 
-import json
+import atexit
+import logging
+import logging.handlers
+import os
+import pickle
+import queue
+import sys
 from typing import Any
 
+import orjson
+
+logger = logging.getLogger(__name__)
+
+
+def setup_logging() -> None:
+    """Log through a queue so workers never block on writing output."""
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("[%(levelname)s] %(message)s"))
+
+    root = logging.getLogger()
+    root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    # httpx logs every Gemini request at INFO
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    listener = logging.handlers.QueueListener(log_queue, handler)
+    listener.start()
+    # Drain queued records before the interpreter exits
+    atexit.register(listener.stop)
+
+
+def _load_cached_config(config_path: str, cache_path: str) -> dict[str, Any] | None:
+    """Return the pickled config if it is newer than the config file."""
+    try:
+        if os.path.getmtime(cache_path) <= os.path.getmtime(config_path):
+            return None
+        with open(cache_path, "rb") as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+
+
+def _write_cached_config(cache_path: str, config: dict[str, Any]) -> None:
+    """Atomically write the parsed config next to the config file."""
+    tmp_path = f"{cache_path}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            pickle.dump(config, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        # Caching is best effort, e.g. the config directory may be read-only
+        logger.warning("Could not write config cache %s: %s", cache_path, e)
+
 
 def load_config(config_path: str) -> dict[str, Any]:
-    """Load configuration from JSON file."""
+    """Load configuration from JSON file, using a pickled cache when fresh."""
+    cache_path = f"{config_path}.pkl"
+    cached = _load_cached_config(config_path, cache_path)
+    if cached is not None:
+        logger.info("Loaded cached config for %s", config_path)
+        return cached
+
     try:
-        with open(config_path, "r") as f:
-            config = json.load(f)
-        print(f"[INFO] Loaded config from {config_path}")
-        return config
+        with open(config_path, "rb") as f:
+            config = orjson.loads(f.read())
+        logger.info("Loaded config from %s", config_path)
     except FileNotFoundError:
-        print(f"[ERROR] Config file not found: {config_path}")
+        logger.error("Config file not found: %s", config_path)
         raise
-    except json.JSONDecodeError as e:
-        print(f"[ERROR] Invalid JSON in config file: {e}")
+    except orjson.JSONDecodeError as e:
+        logger.error("Invalid JSON in config file: %s", e)
         raise
+
+    _write_cached_config(cache_path, config)
+    return config
+
+
+class JSONArrayStream:
+    """Incrementally decode the items of a JSON array received in chunks."""
+
+    def __init__(self) -> None:
+        self._pending = ""
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._started = False
+        self._finished = False
+        self._expect_item = False
+
+    def _emit(self, text: str, items: list[Any], closing: bool) -> None:
+        if text.strip():
+            items.append(orjson.loads(text))
+        elif self._expect_item or not closing:
+            # Only "[]" may have nothing between its delimiters
+            raise ValueError("Empty item in JSON array")
+
+    def feed(self, chunk: str) -> list[Any]:
+        """Feed the next chunk of text, returning the items it completed."""
+        items: list[Any] = []
+        item_start = 0
+
+        for i, char in enumerate(chunk):
+            if self._finished:
+                if not char.isspace():
+                    raise ValueError("Unexpected data after JSON array")
+            elif not self._started:
+                if char == "[":
+                    self._started = True
+                    item_start = i + 1
+                elif not char.isspace():
+                    raise ValueError("Expected a JSON array")
+            elif self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif self._depth:
+                if char in "}]":
+                    self._depth -= 1
+            elif char in ",]":
+                # Item boundary at the top level of the array
+                self._emit(self._pending + chunk[item_start:i], items, char == "]")
+                self._pending = ""
+                item_start = i + 1
+                self._expect_item = char == ","
+                self._finished = char == "]"
+            elif char == "}":
+                raise ValueError("Unbalanced '}' in JSON array")
+
+        if self._started and not self._finished:
+            self._pending += chunk[item_start:]
+        return items
+
+    def close(self) -> None:
+        """Check that the array was complete, an empty stream counts as []."""
+        if self._started and not self._finished:
+            raise ValueError("Truncated JSON array")